@@ -0,0 +1,38 @@
+"""Point transformation for FreeTypePen, compiled with Cython when available."""
+
+try:
+    import cython
+except (AttributeError, ImportError):
+    # if cython not installed, use mock module with no-op decorators and types
+    from fontTools.misc import cython
+COMPILED = cython.compiled
+
+import math
+
+__all__ = ["transformPoints"]
+
+
+@cython.locals(
+    i=cython.int,
+    n=cython.int,
+    x=cython.double,
+    y=cython.double,
+    xx=cython.double,
+    xy=cython.double,
+    yx=cython.double,
+    yy=cython.double,
+    dx=cython.double,
+    dy=cython.double,
+)
+def transformPoints(points, out, xx, xy, yx, yy, dx, dy):
+    """Transforms a sequence of ``(x, y)`` points by the affine transformation
+    ``(xx, xy, yx, yy, dx, dy)``, and writes their interleaved coordinates into
+    ``out`` in 26.6 fixed-point format, rounded the same way as ``otRound``.
+
+    ``out`` must be a mutable sequence of integers twice as long as ``points``.
+    """
+    n = len(points)
+    for i in range(n):
+        x, y = points[i]
+        out[2 * i] = int(math.floor((xx * x + yx * y + dx) * 64 + 0.5))
+        out[2 * i + 1] = int(math.floor((xy * x + yy * y + dy) * 64 + 0.5))
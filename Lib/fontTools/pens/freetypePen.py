@@ -9,10 +9,14 @@ import ctypes
 import platform
 import subprocess
 import collections
+import functools
+import itertools
 import math
+import array
+import threading
 
 import freetype
-from freetype.raw import FT_Outline_Get_Bitmap, FT_Outline_Get_BBox, FT_Outline_Get_CBox
+from freetype.raw import FT_Outline_Get_Bitmap, FT_Outline_Get_BBox
 from freetype.ft_types import FT_Pos
 from freetype.ft_structs import FT_Vector, FT_BBox, FT_Bitmap, FT_Outline
 from freetype.ft_enums import (
@@ -26,11 +30,16 @@ from freetype.ft_enums import (
 from freetype.ft_errors import FT_Exception
 
 from fontTools.pens.basePen import BasePen, PenError
+from fontTools.pens import _freetypeKernels
 from fontTools.misc.roundTools import otRound
-from fontTools.misc.transform import Transform
+from fontTools.misc.transform import Transform, Offset
 
 Contour = collections.namedtuple("Contour", ("points", "tags"))
 
+# Bitmap buffer reused across renderings, one per thread; it only grows to fit
+# the largest bitmap rendered so far.
+_bitmap_pool = threading.local()
+
 
 class FreeTypePen(BasePen):
     """Pen to rasterize paths with FreeType. Requires `freetype-py` module.
@@ -40,7 +49,8 @@ class FreeTypePen(BasePen):
 
     For ``array()`` and ``show()``, `numpy` and `matplotlib` must be installed.
     For ``image()``, `Pillow` is required. Each module is lazily loaded when the
-    corresponding method is called.
+    corresponding method is called. If `numpy` is available, it is also used to
+    speed up the construction of ``FT_Outline``.
 
     Args:
         glyphSet: a dictionary of drawable glyph objects keyed by name
@@ -111,7 +121,120 @@ class FreeTypePen(BasePen):
 
     def __init__(self, glyphSet):
         BasePen.__init__(self, glyphSet)
-        self.contours = []
+        # Points and tags of all the contours are stored in flat lists, and
+        # ``_contour_ends`` holds the index of the last point of each contour
+        # but the current one, so that ``outline()`` needs no per-contour work.
+        self._points = []
+        self._tags = []
+        self._contour_ends = []
+        # Arrays built from the above and the last ``FT_Outline``, reused
+        # until the pen is drawn into again. Drawing only sets ``_dirty``, and
+        # the cached values are dropped the next time one of them is needed.
+        self._dirty = False
+        self._cached_arrays = None
+        self._cached_outline_key = None
+        self._cached_outline = None
+        self._cached_bbox = None
+        self._cached_cbox = None
+
+    @property
+    def contours(self):
+        """The current contours as a tuple of ``Contour(points, tags)`` tuples.
+
+        The contours can't be modified in place; assign a new sequence of
+        contours instead, for example ``pen.contours = []`` to clear the pen.
+        """
+        contours = []
+        start = 0
+        for end in self._endPoints():
+            points = tuple(self._points[start : end + 1])
+            contours.append(Contour(points, tuple(self._tags[start : end + 1])))
+            start = end + 1
+        return tuple(contours)
+
+    @contours.setter
+    def contours(self, contours):
+        allPoints, tags, ends = [], [], []
+        for points, pointTags in contours:
+            if len(points) != len(pointTags):
+                raise PenError("Contour points and tags must have the same length")
+            if not points:
+                continue
+            if tags:
+                ends.append(len(tags) - 1)
+            allPoints.extend(points)
+            tags.extend(pointTags)
+        self._dirty = True
+        self._points, self._tags, self._contour_ends = allPoints, tags, ends
+
+    def _endPoints(self):
+        if not self._tags:
+            return []
+        return self._contour_ends + [len(self._tags) - 1]
+
+    def _checkCache(self):
+        if self._dirty:
+            self._cached_arrays = None
+            self._cached_outline_key = None
+            self._cached_outline = None
+            self._cached_bbox = None
+            self._cached_cbox = None
+            self._dirty = False
+
+    def _arrays(self):
+        """Returns the ``FT_Outline.tags`` and ``FT_Outline.contours`` arrays
+        of the current contours."""
+        self._checkCache()
+        if self._cached_arrays is None:
+            # The stored ends are converted in one go, and only the end of
+            # the last contour is added, so no list is built per outline.
+            tags = self._tags
+            if len(tags) > _MAX_OUTLINE_POINTS:
+                raise PenError(
+                    "FT_Outline supports at most %d points, got %d"
+                    % (_MAX_OUTLINE_POINTS, len(tags))
+                )
+            contours = array.array(ctypes.c_short._type_, self._contour_ends)
+            if tags:
+                contours.append(len(tags) - 1)
+            self._cached_arrays = (
+                (ctypes.c_ubyte * len(tags)).from_buffer_copy(bytes(tags)),
+                (ctypes.c_short * len(contours)).from_buffer_copy(contours),
+            )
+        return self._cached_arrays
+
+    def drawGlyphs(self, glyphs):
+        """Draws a run of positioned glyphs from the pen's glyph set.
+
+        All the glyphs end up in the same ``FT_Outline``, so the whole run is
+        rendered with a single call to ``buffer()``, ``array()``, ``image()``
+        or ``show()``, rather than rendering each glyph with its own pen and
+        compositing the bitmaps.
+
+        An ``FT_Outline`` holds at most 32767 points, so longer runs must be
+        split across several pens; rendering raises ``PenError`` otherwise.
+
+        Args:
+            glyphs: An iterable of ``(glyphName, x, y)`` tuples, where ``x`` and
+                ``y`` are the position of the glyph's origin. Missing glyphs are
+                handled as missing components in ``addComponent()``.
+
+        Raises:
+            PenError: If the pen was created without a glyph set.
+
+        Example:
+            .. code-block:: pycon
+
+                >>>
+                >> glyphSet = font.getGlyphSet()
+                >> pen = FreeTypePen(glyphSet)
+                >> pen.drawGlyphs([("T", 0, 0), ("o", 520, 0), ("f", 1080, 0)])
+                >> buf, size = pen.buffer(width=1500, height=1000)
+        """
+        if self.glyphSet is None:
+            raise PenError("drawGlyphs() requires a pen created with a glyph set")
+        for glyphName, x, y in glyphs:
+            self.addComponent(glyphName, Offset(x, y))
 
     def outline(self, transform=None, evenOdd=False):
         """Converts the current contours to ``FT_Outline``.
@@ -121,39 +244,32 @@ class FreeTypePen(BasePen):
                 or a ``Transform`` object from the ``fontTools.misc.transform``
                 module.
             evenOdd: Pass ``True`` for even-odd fill instead of non-zero.
+
+        Notes:
+            The last outline is cached and returned again for the same
+            ``transform`` and ``evenOdd`` until the pen is drawn into, so it
+            should not be modified in place.
         """
         transform = transform or Transform()
         if not hasattr(transform, "transformPoint"):
             transform = Transform(*transform)
-        n_contours = len(self.contours)
-        n_points = sum((len(contour.points) for contour in self.contours))
-        points = []
-        for contour in self.contours:
-            for point in contour.points:
-                point = transform.transformPoint(point)
-                points.append(
-                    FT_Vector(
-                        FT_Pos(otRound(point[0] * 64)), FT_Pos(otRound(point[1] * 64))
-                    )
-                )
-        tags = []
-        for contour in self.contours:
-            for tag in contour.tags:
-                tags.append(tag)
-        contours = []
-        contours_sum = 0
-        for contour in self.contours:
-            contours_sum += len(contour.points)
-            contours.append(contours_sum - 1)
+        key = (tuple(transform), bool(evenOdd))
+        self._checkCache()
+        if self._cached_outline_key == key:
+            return self._cached_outline
+        tags, contours = self._arrays()
         flags = FT_OUTLINE_EVEN_ODD_FILL if evenOdd else FT_OUTLINE_NONE
-        return FT_Outline(
-            (ctypes.c_short)(n_contours),
-            (ctypes.c_short)(n_points),
-            (FT_Vector * n_points)(*points),
-            (ctypes.c_ubyte * n_points)(*tags),
-            (ctypes.c_short * n_contours)(*contours),
+        outline = FT_Outline(
+            (ctypes.c_short)(len(contours)),
+            (ctypes.c_short)(len(tags)),
+            _transformPoints(self._points, transform),
+            tags,
+            contours,
             (ctypes.c_int)(flags),
         )
+        self._cached_outline_key = key
+        self._cached_outline = outline
+        return outline
 
     def buffer(
         self, width=None, height=None, transform=None, contain=False, evenOdd=False
@@ -198,6 +314,12 @@ class FreeTypePen(BasePen):
                 >> type(buf), len(buf), size
                 (<class 'bytes'>, 500000, (500, 1000))
         """
+        buf, size = self._render(width, height, transform, contain, evenOdd)
+        return ctypes.string_at(buf, size[0] * size[1]), size
+
+    def _render(self, width, height, transform, contain, evenOdd):
+        # Returns the thread's shared bitmap buffer, which may be larger than
+        # the bitmap and is overwritten by the next rendering, and the size.
         transform = transform or Transform()
         if not hasattr(transform, "transformPoint"):
             transform = Transform(*transform)
@@ -228,7 +350,16 @@ class FreeTypePen(BasePen):
                     height = max(height, max(*py) - min(min(*py), 0.0))
             transform = Transform(*transform[:4], dx, dy)
         width, height = math.ceil(width), math.ceil(height)
-        buf = ctypes.create_string_buffer(width * height)
+        size = width * height
+        if size < 0:
+            # Checked here as a pooled buffer would be cleared with a negative
+            # length otherwise.
+            raise ValueError("Array length must be >= 0")
+        buf = getattr(_bitmap_pool, "buf", None)
+        if buf is None or len(buf) < size:
+            buf = _bitmap_pool.buf = ctypes.create_string_buffer(size)
+        else:
+            ctypes.memset(buf, 0, size)
         bitmap = FT_Bitmap(
             (ctypes.c_int)(height),
             (ctypes.c_int)(width),
@@ -245,10 +376,17 @@ class FreeTypePen(BasePen):
         )
         if err != 0:
             raise FT_Exception(err)
-        return buf.raw, (width, height)
+        return buf, (width, height)
 
     def array(
-        self, width=None, height=None, transform=None, contain=False, evenOdd=False
+        self,
+        width=None,
+        height=None,
+        transform=None,
+        contain=False,
+        evenOdd=False,
+        dtype="float32",
+        normalize=True,
     ):
         """Returns the rendered contours as a numpy array. Requires `numpy`.
 
@@ -264,10 +402,14 @@ class FreeTypePen(BasePen):
                 so that it fits to the bounding box of the paths. Useful for
                 rendering glyphs with negative sidebearings without clipping.
             evenOdd: Pass ``True`` for even-odd fill instead of non-zero.
+            dtype: The floating-point type of the normalized array.
+            normalize: If ``False``, the coverage values of the bitmap are
+                returned unscaled as ``uint8``, and ``dtype`` is ignored.
 
         Returns:
             A ``numpy.ndarray`` object with a shape of ``(height, width)``.
-            Each element takes a value in the range of ``[0.0, 1.0]``.
+            Each element takes a value in the range of ``[0.0, 1.0]``, or of
+            ``[0, 255]`` if ``normalize`` is ``False``.
 
         Notes:
             The image size should always be given explicitly if you need to get
@@ -292,14 +434,14 @@ class FreeTypePen(BasePen):
 
         import numpy as np
 
-        buf, size = self.buffer(
-            width=width,
-            height=height,
-            transform=transform,
-            contain=contain,
-            evenOdd=evenOdd,
-        )
-        return np.frombuffer(buf, "B").reshape((size[1], size[0])) / 255.0
+        buf, size = self._render(width, height, transform, contain, evenOdd)
+        arr = np.frombuffer(buf, dtype=np.uint8, count=size[0] * size[1])
+        arr = arr.reshape((size[1], size[0]))
+        if not normalize:
+            return arr.copy()
+        out = np.empty(arr.shape, dtype=dtype)
+        np.divide(arr, np.asarray(255, dtype=out.dtype), out=out)
+        return out
 
     def show(
         self, width=None, height=None, transform=None, contain=False, evenOdd=False
@@ -346,8 +488,9 @@ class FreeTypePen(BasePen):
             transform=transform,
             contain=contain,
             evenOdd=evenOdd,
+            normalize=False,
         )
-        plt.imshow(a, cmap="gray_r", vmin=0, vmax=1)
+        plt.imshow(a, cmap="gray_r", vmin=0, vmax=255)
         plt.show()
 
     def image(
@@ -395,16 +538,9 @@ class FreeTypePen(BasePen):
         """
         from PIL import Image
 
-        buf, size = self.buffer(
-            width=width,
-            height=height,
-            transform=transform,
-            contain=contain,
-            evenOdd=evenOdd,
-        )
-        img = Image.new("L", size, 0)
-        img.putalpha(Image.frombuffer("L", size, buf))
-        return img
+        buf, size = self._render(width, height, transform, contain, evenOdd)
+        alpha = Image.frombuffer("L", size, buf, "raw", "L", 0, 1)
+        return Image.merge("LA", (_blackImage(size), alpha))
 
     @property
     def bbox(self):
@@ -413,10 +549,22 @@ class FreeTypePen(BasePen):
         Returns:
             A tuple of ``(xMin, yMin, xMax, yMax)``.
         """
-        bbox = FT_BBox()
-        outline = self.outline()
-        FT_Outline_Get_BBox(ctypes.byref(outline), ctypes.byref(bbox))
-        return (bbox.xMin / 64.0, bbox.yMin / 64.0, bbox.xMax / 64.0, bbox.yMax / 64.0)
+        self._checkCache()
+        if self._cached_bbox is None:
+            if self._tags.count(FT_CURVE_TAG_ON) == len(self._tags):
+                # Without off-curve points, the control box is exact.
+                self._cached_bbox = self.cbox
+            else:
+                bbox = FT_BBox()
+                outline = self.outline()
+                FT_Outline_Get_BBox(ctypes.byref(outline), ctypes.byref(bbox))
+                self._cached_bbox = (
+                    bbox.xMin / 64.0,
+                    bbox.yMin / 64.0,
+                    bbox.xMax / 64.0,
+                    bbox.yMax / 64.0,
+                )
+        return self._cached_bbox
 
     @property
     def cbox(self):
@@ -425,38 +573,112 @@ class FreeTypePen(BasePen):
         Returns:
             A tuple of ``(xMin, yMin, xMax, yMax)``.
         """
-        cbox = FT_BBox()
-        outline = self.outline()
-        FT_Outline_Get_CBox(ctypes.byref(outline), ctypes.byref(cbox))
-        return (cbox.xMin / 64.0, cbox.yMin / 64.0, cbox.xMax / 64.0, cbox.yMax / 64.0)
+        self._checkCache()
+        if self._cached_cbox is None:
+            self._cached_cbox = self._cbox_fast()
+        return self._cached_cbox
+
+    def _cbox_fast(self):
+        # Same as FT_Outline_Get_CBox, without building the outline: rounding
+        # to 26.6 is monotonic, so the extrema can be rounded after the fact.
+        if not self._tags:
+            return (0.0, 0.0, 0.0, 0.0)
+        # Faster than converting the points to a numpy array first.
+        xs, ys = zip(*self._points)
+        extrema = (min(xs), min(ys), max(xs), max(ys))
+        return tuple(otRound(v * 64) / 64.0 for v in extrema)
 
     def _moveTo(self, pt):
-        contour = Contour([], [])
-        self.contours.append(contour)
-        contour.points.append(pt)
-        contour.tags.append(FT_CURVE_TAG_ON)
+        self._dirty = True
+        if self._tags:
+            self._contour_ends.append(len(self._tags) - 1)
+        self._points.append(pt)
+        self._tags.append(FT_CURVE_TAG_ON)
 
     def _lineTo(self, pt):
-        if not (self.contours and len(self.contours[-1].points) > 0):
+        self._dirty = True
+        if not self._tags:
             raise PenError("Contour missing required initial moveTo")
-        contour = self.contours[-1]
-        contour.points.append(pt)
-        contour.tags.append(FT_CURVE_TAG_ON)
+        self._points.append(pt)
+        self._tags.append(FT_CURVE_TAG_ON)
 
     def _curveToOne(self, p1, p2, p3):
-        if not (self.contours and len(self.contours[-1].points) > 0):
+        self._dirty = True
+        if not self._tags:
             raise PenError("Contour missing required initial moveTo")
-        t1, t2, t3 = FT_CURVE_TAG_CUBIC, FT_CURVE_TAG_CUBIC, FT_CURVE_TAG_ON
-        contour = self.contours[-1]
-        for p, t in ((p1, t1), (p2, t2), (p3, t3)):
-            contour.points.append(p)
-            contour.tags.append(t)
+        self._points.extend((p1, p2, p3))
+        self._tags.extend((FT_CURVE_TAG_CUBIC, FT_CURVE_TAG_CUBIC, FT_CURVE_TAG_ON))
 
     def _qCurveToOne(self, p1, p2):
-        if not (self.contours and len(self.contours[-1].points) > 0):
+        self._dirty = True
+        if not self._tags:
             raise PenError("Contour missing required initial moveTo")
-        t1, t2 = FT_CURVE_TAG_CONIC, FT_CURVE_TAG_ON
-        contour = self.contours[-1]
-        for p, t in ((p1, t1), (p2, t2)):
-            contour.points.append(p)
-            contour.tags.append(t)
+        self._points.extend((p1, p2))
+        self._tags.extend((FT_CURVE_TAG_CONIC, FT_CURVE_TAG_ON))
+
+
+# FT_Outline.n_points and the contour end indices are signed shorts.
+_MAX_OUTLINE_POINTS = 0x7FFF
+
+
+@functools.lru_cache(maxsize=8)
+def _blackImage(size):
+    # Shared between images; Image.merge() copies it, so it's never modified.
+    from PIL import Image
+
+    return Image.new("L", size, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    # Looked up once: a failed import isn't cached by Python, and retrying it
+    # on each outline would cost more than the transform itself.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# Below this many points, the transform kernel is faster than numpy, whose
+# fixed cost per operation dominates for small outlines. The crossover is at
+# about 130 points when the kernel is compiled, and about 28 when it isn't.
+_MAX_POINTS_FOR_KERNEL = 128 if _freetypeKernels.COMPILED else 28
+
+
+def _transformPoints(points, transform):
+    """Transforms a list of ``(x, y)`` points and converts them to an array of
+    ``FT_Vector`` in 26.6 fixed-point format, rounded the same way as
+    ``otRound``.
+
+    Uses numpy to process all the points at once if available, unless the
+    outline is small enough for the kernel to be faster.
+    """
+    n_points = len(points)
+    np = _numpy()
+    if np is None or n_points < _MAX_POINTS_FOR_KERNEL:
+        # Collect the coordinates in a typed array and copy it over as a whole,
+        # rather than creating one ctypes object per point.
+        out = array.array(FT_Pos._type_, [0]) * (2 * n_points)
+        _freetypeKernels.transformPoints(points, out, *transform)
+        return (FT_Vector * n_points).from_buffer_copy(out)
+
+    result = (FT_Vector * n_points)()
+    if n_points:
+        xx, xy, yx, yy, dx, dy = transform
+        # Fold the conversion to 26.6 into the transform; scaling by a power
+        # of two is exact, so this gives the same result as scaling after.
+        matrix = np.array([[xx, xy], [yx, yy]], dtype=np.float64) * 64.0
+        offset = np.array([dx, dy], dtype=np.float64) * 64.0
+        coords = itertools.chain.from_iterable(points)
+        pts = np.fromiter(coords, np.float64, 2 * n_points).reshape(n_points, 2)
+        pts = pts @ matrix
+        pts += offset
+        # Same as otRound, i.e. rounding half up; np.rint() would round half
+        # to even instead. Not folded into the offset, which might change the
+        # rounding of ties.
+        pts += 0.5
+        np.floor(pts, out=pts)
+        coords = pts.astype(np.dtype(FT_Pos))
+        ctypes.memmove(result, coords.ctypes.data, coords.nbytes)
+    return result
@@ -116,6 +116,11 @@ class InterpolatablePlot:
         self.glyphsets = glyphsets
         self.names = names or [repr(g) for g in glyphsets]
         self.toc = {}
+        self._label_surface = None
+        self._label_context = None
+        self._label_fonts = {}
+        self._recordings_glyphname = None
+        self._recordings_cache = {}
 
         for k, v in kwargs.items():
             if not hasattr(self, k):
@@ -810,17 +815,28 @@ class InterpolatablePlot:
             height = self.height
         if font_size is None:
             font_size = self.font_size
-        cr = cairo.Context(self.surface)
+        # Labels are all drawn with the same context, as long as the surface
+        # doesn't change, and the font size and ascent are computed only once
+        # for each requested font size.
+        if self._label_surface is not self.surface:
+            self._label_surface = self.surface
+            self._label_context = cairo.Context(self.surface)
+        cr = self._label_context
         cr.select_font_face(
             "@cairo:",
             cairo.FONT_SLANT_NORMAL,
             cairo.FONT_WEIGHT_BOLD if bold else cairo.FONT_WEIGHT_NORMAL,
         )
+        key = (bold, font_size)
+        if key not in self._label_fonts:
+            cr.set_font_size(font_size)
+            font_extents = cr.font_extents()
+            scaled_font_size = font_size * font_size / font_extents[2]
+            cr.set_font_size(scaled_font_size)
+            font_extents = cr.font_extents()
+            self._label_fonts[key] = (scaled_font_size, font_extents[0])
+        font_size, font_ascent = self._label_fonts[key]
         cr.set_font_size(font_size)
-        font_extents = cr.font_extents()
-        font_size = font_size * font_size / font_extents[2]
-        cr.set_font_size(font_size)
-        font_extents = cr.font_extents()
 
         cr.set_source_rgb(*color)
 
@@ -829,26 +845,30 @@ class InterpolatablePlot:
             # Shrink
             font_size *= width / extents.width
             cr.set_font_size(font_size)
-            font_extents = cr.font_extents()
+            font_ascent = cr.font_extents()[0]
             extents = cr.text_extents(label)
 
         # Center
         label_x = x + (width - extents.width) * align
-        label_y = y + font_extents[0]
+        label_y = y + font_ascent
         cr.move_to(label_x, label_y)
         cr.show_text(label)
 
-    def draw_glyph(self, glyphset, glyphname, problems, which, *, x=0, y=0, scale=None):
-        if type(problems) not in (list, tuple):
-            problems = [problems]
+    def _glyph_recordings(self, glyphset, glyphname):
+        # The same glyph of a master is usually drawn on several pages in a
+        # row, so the recordings and bounds of the glyph currently being
+        # plotted are kept for the glyph sets of the report. Others, like
+        # the mid-way interpolations, are temporary and not cached.
+        cacheable = any(glyphset is g for g in self.glyphsets)
+        if cacheable:
+            if self._recordings_glyphname != glyphname:
+                self._recordings_glyphname = glyphname
+                self._recordings_cache = {}
+            cached = self._recordings_cache.get(id(glyphset))
+            if cached is not None:
+                return cached
 
-        midway = any(problem["type"] == "midway" for problem in problems)
-        problem_type = problems[0]["type"]
-        problem_types = set(problem["type"] for problem in problems)
-        if not all(pt == problem_type for pt in problem_types):
-            problem_type = "mixed"
         glyph = glyphset[glyphname]
-
         recording = RecordingPen()
         glyph.draw(recording)
         decomposedRecording = DecomposingRecordingPen(glyphset)
@@ -860,6 +880,37 @@ class InterpolatablePlot:
         if bounds is None:
             bounds = (0, 0, 0, 0)
 
+        result = (recording, decomposedRecording, bounds, {})
+        if cacheable:
+            self._recordings_cache[id(glyphset)] = result
+        return result
+
+    def draw_glyph(self, glyphset, glyphname, problems, which, *, x=0, y=0, scale=None):
+        if type(problems) not in (list, tuple):
+            problems = [problems]
+
+        midway = any(problem["type"] == "midway" for problem in problems)
+        problem_type = problems[0]["type"]
+        problem_types = set(problem["type"] for problem in problems)
+        if not all(pt == problem_type for pt in problem_types):
+            problem_type = "mixed"
+
+        recording, decomposedRecording, bounds, perContourValues = (
+            self._glyph_recordings(glyphset, glyphname)
+        )
+
+        # Split the recordings into contours at most once, however many of
+        # the problems below need them.
+        def perContour(recording):
+            key = id(recording)
+            if key not in perContourValues:
+                perContourPen = PerContourOrComponentPen(
+                    RecordingPen, glyphset=glyphset
+                )
+                recording.replay(perContourPen)
+                perContourValues[key] = perContourPen.value
+            return perContourValues[key]
+
         glyph_width = bounds[2] - bounds[0]
         glyph_height = bounds[3] - bounds[1]
 
@@ -911,14 +962,13 @@ class InterpolatablePlot:
             InterpolatableProblem.UNDERWEIGHT in problem_types
             or InterpolatableProblem.OVERWEIGHT in problem_types
         ):
-            perContourPen = PerContourOrComponentPen(RecordingPen, glyphset=glyphset)
-            recording.replay(perContourPen)
+            contours = perContour(recording)
             for problem in problems:
                 if problem["type"] in (
                     InterpolatableProblem.UNDERWEIGHT,
                     InterpolatableProblem.OVERWEIGHT,
                 ):
-                    contour = perContourPen.value[problem["contour"]]
+                    contour = contours[problem["contour"]]
                     contour.replay(CairoPen(glyphset, cr))
                     cr.set_source_rgba(*self.weight_issue_contour_color)
                     cr.fill()
@@ -985,11 +1035,7 @@ class InterpolatablePlot:
             if problem["type"] == InterpolatableProblem.CONTOUR_ORDER:
                 matching = problem["value_2"]
                 colors = cycle(self.contour_colors)
-                perContourPen = PerContourOrComponentPen(
-                    RecordingPen, glyphset=glyphset
-                )
-                recording.replay(perContourPen)
-                for i, contour in enumerate(perContourPen.value):
+                for i, contour in enumerate(perContour(recording)):
                     if matching[i] == i:
                         continue
                     color = next(colors)
@@ -1006,13 +1052,9 @@ class InterpolatablePlot:
 
                 # Draw suggested point
                 if idx is not None and which == 1 and "value_2" in problem:
-                    perContourPen = PerContourOrComponentPen(
-                        RecordingPen, glyphset=glyphset
-                    )
-                    decomposedRecording.replay(perContourPen)
                     points = SimpleRecordingPointPen()
                     converter = SegmentToPointPen(points, False)
-                    perContourPen.value[
+                    perContour(decomposedRecording)[
                         idx if matching is None else matching[idx]
                     ].replay(converter)
                     targetPoint = points.value[problem["value_2"]][0]
@@ -1081,15 +1123,11 @@ class InterpolatablePlot:
 
             if problem["type"] == InterpolatableProblem.KINK:
                 idx = problem.get("contour")
-                perContourPen = PerContourOrComponentPen(
-                    RecordingPen, glyphset=glyphset
-                )
-                decomposedRecording.replay(perContourPen)
                 points = SimpleRecordingPointPen()
                 converter = SegmentToPointPen(points, False)
-                perContourPen.value[idx if matching is None else matching[idx]].replay(
-                    converter
-                )
+                perContour(decomposedRecording)[
+                    idx if matching is None else matching[idx]
+                ].replay(converter)
 
                 targetPoint = points.value[problem["value"]][0]
                 cr.save()
@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import contextlib
 import os
 import math
 
@@ -10,10 +12,18 @@ except ImportError:
     FREETYPE_PY_AVAILABLE = False
 
 from fontTools.misc.transform import Scale, Offset
+from fontTools.pens.basePen import PenError
+from fontTools.pens.transformPen import TransformPen
 
 DATA_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
 
 
+def withoutNumpy():
+    from fontTools.pens import freetypePen
+
+    return mock.patch.object(freetypePen, "_numpy", lambda: None)
+
+
 def box(pen, offset=(0, 0)):
     pen.moveTo((0 + offset[0], 0 + offset[1]))
     pen.lineTo((0 + offset[0], 500 + offset[1]))
@@ -228,6 +238,214 @@ class FreeTypePenTest(unittest.TestCase):
         self.assertEqual(size, (500, 500))
         self.assertEqual(buf1, buf2)
 
+    def test_contours(self):
+        pen = FreeTypePen(None)
+        box(pen)
+        draw_cubic(pen)
+        contours = pen.contours
+        self.assertEqual(len(contours), 2)
+        self.assertEqual(contours[0].points, ((0, 0), (0, 500), (500, 500), (500, 0)))
+        self.assertEqual(contours[0].tags, (1, 1, 1, 1))
+        self.assertEqual(len(contours[1].points), 9)
+        self.assertEqual(contours[1].tags, (1, 1, 1, 2, 2, 1, 2, 2, 1))
+        # contours can't be modified in place, only replaced
+        with self.assertRaises(AttributeError):
+            contours.clear()
+        with self.assertRaises(AttributeError):
+            contours[0].points.append((0, 0))
+        bbox = pen.bbox
+        pen.contours = pen.contours[::-1]
+        self.assertEqual(pen.contours[0].tags, (1, 1, 1, 2, 2, 1, 2, 2, 1))
+        self.assertEqual(pen.outline().n_points, 13)
+        self.assertEqual(pen.bbox, bbox)
+        pen.contours = []
+        self.assertEqual(pen.contours, ())
+        self.assertEqual(pen.outline().n_points, 0)
+        self.assertEqual(pen.bbox, (0.0, 0.0, 0.0, 0.0))
+        with self.assertRaises(PenError):
+            pen.contours = [([(0, 0), (1, 1)], [1])]
+
+    def test_without_numpy(self):
+        pen1, pen2 = FreeTypePen(None), FreeTypePen(None)
+        star(pen1)
+        t = Scale(0.05, 0.05).rotate(math.pi / 6.0).translate(100, 200)
+        buf1, size1 = pen1.buffer(width=100, height=100, transform=t)
+        with withoutNumpy():
+            star(pen2)
+            buf2, size2 = pen2.buffer(width=100, height=100, transform=t)
+        self.assertEqual(size1, size2)
+        self.assertEqual(buf1, buf2)
+
+    def test_outline_cache(self):
+        pen = FreeTypePen(None)
+        box(pen)
+        outline = pen.outline()
+        self.assertIs(pen.outline(), outline)
+        self.assertIsNot(pen.outline(evenOdd=True), outline)
+        self.assertEqual(pen.bbox, (0.0, 0.0, 500.0, 500.0))
+        box(pen, offset=(500, 500))
+        self.assertEqual(pen.outline().n_points, 8)
+        self.assertEqual(pen.outline().n_contours, 2)
+        self.assertEqual(pen.bbox, (0.0, 0.0, 1000.0, 1000.0))
+
+    def test_outline_rounding(self):
+        from fontTools.misc.roundTools import otRound
+        from fontTools.pens import freetypePen
+
+        values = [-1.5, -0.5, 0.5, 1.5, 2.5, -2.5, 0.49, -0.51]
+        # numpy, if installed, and the transform kernel
+        for threshold in (0, len(values) + 2):
+            with mock.patch.object(freetypePen, "_MAX_POINTS_FOR_KERNEL", threshold):
+                pen = FreeTypePen(None)
+                pen.moveTo((0, 0))
+                for v in values:
+                    pen.lineTo((v / 64, -v / 64))
+                pen.closePath()
+                outline = pen.outline()
+                self.assertEqual(
+                    [outline.points[i + 1].x for i in range(len(values))],
+                    [otRound(v) for v in values],
+                )
+                self.assertEqual(
+                    [outline.points[i + 1].y for i in range(len(values))],
+                    [otRound(-v) for v in values],
+                )
+
+    def test_array(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("numpy not installed")
+        pen = FreeTypePen(None)
+        star(pen)
+        t = Scale(0.05, 0.05).translate(0, 200)
+        buf, size = pen.buffer(width=50, height=50, transform=t)
+        expected = np.frombuffer(buf, dtype=np.uint8).reshape((size[1], size[0]))
+        arr = pen.array(width=50, height=50, transform=t)
+        self.assertEqual(arr.dtype, np.float32)
+        self.assertEqual(arr.shape, (50, 50))
+        self.assertTrue(np.allclose(arr, expected / 255.0))
+        arr = pen.array(width=50, height=50, transform=t, dtype=np.float64)
+        self.assertEqual(arr.dtype, np.float64)
+        self.assertTrue(np.array_equal(arr, expected / 255.0))
+        arr = pen.array(width=50, height=50, transform=t, normalize=False)
+        self.assertEqual(arr.dtype, np.uint8)
+        self.assertTrue(np.array_equal(arr, expected))
+        pen.buffer(width=100, height=100)
+        self.assertTrue(np.array_equal(arr, expected))
+
+    def test_reuse_bitmap_buffer(self):
+        pen1, pen2 = FreeTypePen(None), FreeTypePen(None)
+        box(pen1)
+        box(pen2, offset=(250, 250))
+        buf1, size1 = pen1.buffer(width=1000, height=1000)
+        buf2, size2 = pen2.buffer(width=500, height=500)
+        self.assertEqual(size1, (1000, 1000))
+        self.assertEqual(size2, (500, 500))
+        self.assertEqual(buf1.count(b"\xff"), 500 * 500)
+        self.assertEqual(buf2.count(b"\xff"), 250 * 250)
+        self.assertEqual(len(buf2), 500 * 500)
+        self.assertEqual(buf1, pen1.buffer(width=1000, height=1000)[0])
+
+    def test_negative_bitmap_size(self):
+        pen = FreeTypePen(None)
+        box(pen)
+        pen.buffer(width=100, height=100)
+        with self.assertRaisesRegex(ValueError, "Array length must be >= 0"):
+            pen.buffer(width=-5, height=10)
+
+    def test_draw_glyphs(self):
+        from fontTools.pens.recordingPen import RecordingPen
+
+        glyphSet = {}
+        for name, draw in (("box", box), ("star", star)):
+            rec = RecordingPen()
+            draw(rec)
+            glyphSet[name] = rec
+        pen1 = FreeTypePen(glyphSet)
+        pen1.drawGlyphs([("box", 0, 0), ("star", 500, 0), ("box", 1500, 250)])
+        pen2 = FreeTypePen(None)
+        box(pen2)
+        star(TransformPen(pen2, Offset(500, 0)))
+        box(pen2, offset=(1500, 250))
+        self.assertEqual(pen1.contours, pen2.contours)
+        self.assertEqual(pen1.outline().n_contours, 3)
+        buf1, size1 = pen1.buffer(width=2000, height=1000)
+        buf2, size2 = pen2.buffer(width=2000, height=1000)
+        self.assertEqual(size1, size2)
+        self.assertEqual(buf1, buf2)
+        # 8192 boxes, i.e. 32768 points, don't fit in an FT_Outline
+        pen = FreeTypePen(glyphSet)
+        pen.drawGlyphs(("box", 600 * i, 0) for i in range(8192))
+        with self.assertRaisesRegex(PenError, "at most 32767 points"):
+            pen.buffer(width=100, height=100)
+        pen.contours = pen.contours[1:]
+        self.assertEqual(pen.outline().n_points, 32764)
+        with self.assertRaisesRegex(PenError, "glyph set"):
+            FreeTypePen(None).drawGlyphs([("box", 0, 0)])
+
+    def test_bbox_and_cbox_from_coordinates(self):
+        import ctypes
+        from freetype.ft_structs import FT_BBox
+        from freetype.raw import FT_Outline_Get_BBox, FT_Outline_Get_CBox
+
+        def ft_box(func, outline):
+            bbox = FT_BBox()
+            func(ctypes.byref(outline), ctypes.byref(bbox))
+            return (bbox.xMin / 64, bbox.yMin / 64, bbox.xMax / 64, bbox.yMax / 64)
+
+        for numpy in (True, False):
+            with contextlib.nullcontext() if numpy else withoutNumpy():
+                for draw in (star, draw_cubic, draw_quadratic):
+                    pen = FreeTypePen(None)
+                    draw(TransformPen(pen, Scale(0.3, 0.7).translate(0.1, -0.2)))
+                    outline = pen.outline()
+                    self.assertEqual(pen.cbox, ft_box(FT_Outline_Get_CBox, outline))
+                    self.assertEqual(pen.bbox, ft_box(FT_Outline_Get_BBox, outline))
+                    pen.moveTo((-1000, -1000))
+                    pen.closePath()
+                    self.assertEqual(pen.cbox[:2], (-1000, -1000))
+                    self.assertEqual(pen.bbox[:2], (-1000, -1000))
+
+    def test_image(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            self.skipTest("Pillow not installed")
+        pen = FreeTypePen(None)
+        star(pen)
+        t = Scale(0.05, 0.05).translate(0, 200)
+        buf, size = pen.buffer(width=50, height=50, transform=t)
+        img = pen.image(width=50, height=50, transform=t)
+        self.assertEqual(img.mode, "LA")
+        self.assertEqual(img.size, size)
+        self.assertEqual(img.getchannel("A").tobytes(), buf)
+        self.assertEqual(img.getchannel("L").tobytes(), b"\0" * len(buf))
+        # the image doesn't share memory with later renderings
+        pen.buffer(width=100, height=100)
+        self.assertEqual(img.getchannel("A").tobytes(), buf)
+
+    def test_transform_kernel(self):
+        import array
+        import random
+        from fontTools.pens import _freetypeKernels
+        from fontTools.pens.freetypePen import _transformPoints
+
+        rng = random.Random(1234)
+        points = [
+            (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)) for _ in range(500)
+        ]
+        t = Scale(0.05, 0.07).rotate(0.3).skew(0.2).translate(12.3, -4.5)
+        expected = array.array("l", [0]) * (2 * len(points))
+        _freetypeKernels.transformPoints(points, expected, *t)
+        for numpy in (True, False):
+            with contextlib.nullcontext() if numpy else withoutNumpy():
+                vectors = _transformPoints(points, t)
+                self.assertEqual(len(vectors), 500)
+                self.assertEqual(
+                    [v for p in vectors for v in (p.x, p.y)], expected.tolist()
+                )
+
 
 if __name__ == "__main__":
     import sys
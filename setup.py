@@ -81,6 +81,12 @@ if with_cython is True or (with_cython is None and has_cython):
     ext_modules.append(
         Extension("fontTools.pens.momentsPen", ["Lib/fontTools/pens/momentsPen.py"]),
     )
+    ext_modules.append(
+        Extension(
+            "fontTools.pens._freetypeKernels",
+            ["Lib/fontTools/pens/_freetypeKernels.py"],
+        ),
+    )
     ext_modules.append(
         Extension("fontTools.varLib.iup", ["Lib/fontTools/varLib/iup.py"]),
     )